@@ -1,8 +1,14 @@
+from collections import Counter
 from typing import List
 
+# number of Cards and piles created so far, by class name; piles are
+# allocated once per Table and reused, so this should not grow per round
+allocations = Counter()
+
 
 class Card:
     def __init__(self, suit, value, owner):
+        allocations[type(self).__name__] += 1
         self.suit = suit  # string
         self.value = value  # number
         self.owner = owner  # string
@@ -63,6 +69,7 @@ class Card:
 
 class Stack:
     def __init__(self, group):
+        allocations[type(self).__name__] += 1
         self.stack: List[Card] = []
         self.group = group
 
@@ -83,7 +90,7 @@ class Stack:
 
     def get_top(self):  # returns the last card placed on the stack
         if self.is_empty():
-            return Card("E", 99, "Error")
+            return EMPTY_CARD
         else:
             return self.stack[len(self.stack)-1]
 
@@ -101,6 +108,10 @@ class Stack:
         self.stack.clear()
 
 
+# returned by get_top() for an empty pile; shared so no Card is made per call
+EMPTY_CARD = Card("E", 99, "Error")
+
+
 class NertzStack(Stack):
     def __init__(self):
         group = "N"
@@ -128,33 +139,28 @@ class HandStack(Stack):
         return len(self.stack)
 
     def flip_three_cards(self):  # flip the last three face down cards in Stack
+        self.flip_cards(3)
+
+    def flip_cards(self, count):  # flip the last 'count' face down cards in Stack
+        if self.is_empty():
+            return
+        count = min(count, len(self.stack))
         top_face_up_idx = self.get_top_face_up_idx()
 
-        if top_face_up_idx > 2:  # flip 3 cards
-            self.stack[top_face_up_idx - 1].face_down = False
-            self.stack[top_face_up_idx - 2].face_down = False
-            self.stack[top_face_up_idx - 3].face_down = False
+        if top_face_up_idx >= count:  # flip 'count' cards
+            for i in range(1, count + 1):
+                self.stack[top_face_up_idx - i].face_down = False
 
         else:  # need to flip all cards in hand & start over
             self.restack_hand(top_face_up_idx)
-            self.stack[len(self.stack) - 1].face_down = False
-            self.stack[len(self.stack) - 2].face_down = False
-            self.stack[len(self.stack) - 3].face_down = False
+            for i in range(1, count + 1):
+                self.stack[len(self.stack) - i].face_down = False
 
     def restack_hand(self, new_top_idx):
-        new_stack: List[Card] = []
-
-        if new_top_idx > 0:
-            for c in range(len(self.stack) - new_top_idx):
-                new_stack.append(self.stack[c + new_top_idx])
-            new_stack.append(self.stack[0])
-            if new_top_idx == 2:
-                new_stack.append(self.stack[1])
-
-            self.empty_stack()
-
-            for card in new_stack:
-                self.add_card(card)
+        # the face down cards left under the face up ones go to the top,
+        # rotated in place so no new list is made
+        for _ in range(new_top_idx):
+            self.stack.append(self.stack.pop(0))
 
         for card in self.stack:
             card.face_down = True
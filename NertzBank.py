@@ -0,0 +1,114 @@
+from NertzSweep import *
+from array import array
+import json
+
+# A round's outcome only depends on the deal and the play within it, never on
+# the scores so far. So rounds can be simulated once, stored in a bank, and
+# whole games put together afterwards by drawing rounds from the bank, which
+# is far cheaper than playing every game.
+#
+# On disk a bank is one line of JSON describing it, followed by one signed
+# byte per player per round (the score change) plus one byte for the timeout
+# flag of that round.
+
+BANK_FORMAT = 1
+
+
+class RoundBank:
+    def __init__(self, config: SweepConfig):
+        self.config = config
+        self.num_players = config.num_players
+        self.data = array('b')  # per round: each player's delta, then timeout
+        self.seeds = []  # [seed, rounds] for every batch simulated
+
+    def get_round_count(self):
+        return len(self.data) // (self.num_players + 1)
+
+    def get_round(self, r):
+        start = r * (self.num_players + 1)
+        return self.data[start:start + self.num_players], self.data[start + self.num_players] == 1
+
+    def simulate(self, rounds, seed):
+        table = self.config.build_table()
+        seed_table(table, seed)
+        game = Game()
+        for r in range(rounds):
+            table.setup_table()
+            table.play_round(game)
+            self.data.extend(table.round_deltas())
+            self.data.append(1 if game.timeout else 0)
+        self.seeds.append([seed, rounds])
+
+    def get_timeout_rate(self):
+        rounds = self.get_round_count()
+        timeouts = sum(1 for r in range(rounds) if self.get_round(r)[1])
+        return timeouts / rounds if rounds > 0 else 0
+
+    def compose(self, games, seed=None, win_score=None, jumps=None):
+        # play 'games' games by drawing rounds from the bank. Like a real game,
+        # a timed out round is replayed, and after rules.max_replays replays
+        # in a row the game ends "stuck". The winning score and jumps can
+        # differ from the banked rules since they don't change how a round
+        # is played.
+        rules = self.config.rules
+        win_score = rules.win_score if win_score is None else win_score
+        jumps = rules.jumps if jumps is None else dict(jumps)
+        rounds = [(tuple(deltas), timeout) for deltas, timeout in map(self.get_round, range(self.get_round_count()))]
+        if len(rounds) == 0:
+            raise ValueError('bank has no rounds')
+
+        rng = random.Random(seed)
+        players = range(self.num_players)
+        stats = GameStats()
+        for g in range(games):
+            scores = [0] * self.num_players
+            round_count = 0
+            replays = 0
+            winner = None
+            while winner is None:
+                deltas, timeout = rounds[rng.randrange(len(rounds))]
+                if timeout:
+                    replays = replays + 1
+                    if replays > rules.max_replays:
+                        winner = "stuck"
+                    continue
+                replays = 0
+                round_count = round_count + 1
+                for p in players:
+                    score = scores[p] + deltas[p]
+                    if score in jumps:
+                        stats.jumps[(score, jumps[score])] += 1
+                        score = jumps[score]
+                    scores[p] = score
+                    if score >= win_score:
+                        winner = NAMES[p]  # like score_round, the last seat over wins
+            stats.add_game(winner, round_count)
+        return stats
+
+    def save(self, path):
+        header = {'format': BANK_FORMAT,
+                  'config': self.config.to_dict(),
+                  'seeds': self.seeds,
+                  'rounds': self.get_round_count()}
+        with open(path, 'wb') as f:
+            f.write((json.dumps(header) + '\n').encode())
+            self.data.tofile(f)
+
+
+def load_bank(path):
+    with open(path, 'rb') as f:
+        header = json.loads(f.readline())
+        if header.get('format') != BANK_FORMAT:
+            raise ValueError('{} is not a round bank this version can read'.format(path))
+        bank = RoundBank(config_from_dict(header['config']))
+        bank.seeds = header['seeds']
+        bank.data.frombytes(f.read())
+    if bank.get_round_count() != header['rounds']:
+        raise ValueError('{} is truncated'.format(path))
+    return bank
+
+
+def build_bank(config: SweepConfig, rounds, seed=0):
+    bank = RoundBank(config)
+    bank.simulate(rounds, seed)
+    return bank
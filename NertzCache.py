@@ -0,0 +1,102 @@
+from NertzSweep import *
+
+# On-disk cache of game results. Results are stored by a hash of the code
+# version and the configuration (players, skills, strategies, rules and
+# engine), in blocks of consecutive seeds, so a repeat or overlapping sweep
+# only plays the games that aren't cached yet. When the cache grows past
+# max_bytes the least recently used blocks are deleted.
+
+BLOCK_SIZE = 100  # seeds per cache file
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+
+class ResultCache:
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = code_version()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def config_hash(self, config: SweepConfig):
+        key = json.dumps([self.version, config.to_dict()], sort_keys=True)
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def block_path(self, config_hash, block):
+        return os.path.join(self.directory, '{}-{}.json'.format(config_hash, block))
+
+    def read_block(self, path):
+        try:
+            with open(path) as f:
+                games = json.load(f)['games']
+        except (OSError, ValueError, KeyError):
+            return {}  # missing, evicted, or half written: just replay it
+        os.utime(path)  # mark as recently used
+        return games
+
+    def write_block(self, path, config, games):
+        with open(path + '.tmp', 'w') as f:
+            json.dump({'code_version': self.version, 'config': config.to_dict(), 'games': games}, f)
+        os.replace(path + '.tmp', path)
+
+    def get_games(self, config: SweepConfig, seeds, progress=None):
+        # returns [seed, winner, round_count] for every seed, in order;
+        # progress, if given, is called with the number of games done so far
+        # after each game, whether it was played or read from the cache
+        config_hash = self.config_hash(config)
+        table = None
+        found = {}
+        seeds = list(seeds)
+        blocks = {}
+        for seed in seeds:
+            blocks.setdefault(seed // BLOCK_SIZE, []).append(seed)
+
+        for block, block_seeds in blocks.items():
+            path = self.block_path(config_hash, block)
+            games = self.read_block(path)
+            changed = False
+            for seed in block_seeds:
+                game = games.get(str(seed))  # JSON keys are always strings
+                if game is None:
+                    if table is None:
+                        table = config.build_table()
+                    played = play_seeded_game(table, seed)
+                    game = [played.winner, played.round_count]
+                    games[str(seed)] = game
+                    changed = True
+                    self.misses = self.misses + 1
+                else:
+                    self.hits = self.hits + 1
+                found[seed] = game
+                if progress is not None:
+                    progress(len(found))
+            if changed:
+                self.write_block(path, config, games)
+
+        self.evict()
+        return [[seed] + found[seed] for seed in seeds]
+
+    def reset_counts(self):
+        self.hits = 0
+        self.misses = 0
+
+    def evict(self):
+        files = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith('.json'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+                total = total + stat.st_size
+        files.sort()
+        for mtime, size, path in files:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total = total - size
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.is_file():
+                os.remove(entry.path)
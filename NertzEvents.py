@@ -0,0 +1,98 @@
+from NertzGame import *
+import heapq
+
+# Event-driven alternative to Table.play_one_tick. Instead of every player
+# acting once per tick, each player acts again after their own reaction time,
+# drawn from a distribution that depends on their skill. Actions happen in
+# order of simulated time, so whoever reaches a Middle pile first gets it.
+#
+# A player who has cycled through their whole Hand without a move can't do
+# anything new until a Middle pile changes, so they are parked until then.
+
+# mean time between actions, in ticks, for each skill level
+REACTION_TIMES = {'bad': 2.0,
+                  'good': 1.5,
+                  'better': 1.25,
+                  'best': 1.0}
+
+REACTION_SHAPE = 4  # gamma shape; higher means more consistent players
+
+
+class EventTable(Table):
+    def __init__(self, rules=None, reaction_times=None):
+        super().__init__(rules)
+        self.reaction_times = REACTION_TIMES if reaction_times is None else reaction_times
+        self.reaction_scales: List[float] = []  # per player, bound in add_player
+        self.middle_changes = 0
+
+    def add_player(self, name, skill, strat):
+        if skill not in self.reaction_times:
+            raise ValueError('no reaction time for skill {}'.format(skill))
+        super().add_player(name, skill, strat)
+        self.reaction_scales.append(self.reaction_times[skill] / REACTION_SHAPE)
+
+    def reaction_time(self, p):
+        return random.gammavariate(REACTION_SHAPE, self.reaction_scales[p])
+
+    def start_middle_stack(self, card: Card):
+        super().start_middle_stack(card)
+        self.middle_changes = self.middle_changes + 1
+
+    def play_round(self, game):
+        # the round times out after rules.timeout ticks of simulated time,
+        # or straight away if every player is parked
+        game.timeout = False
+        events = []
+        parked: List[int] = []
+        seen_hands = [set() for _ in self.players]
+
+        for p in range(len(self.players)):
+            heapq.heappush(events, (self.reaction_time(p), p))
+
+        while len(events) > 0:
+            now, p = heapq.heappop(events)
+            if now > self.timeout:
+                game.timeout = True
+                return
+            player = self.players[p]
+            middle_changes = self.middle_changes
+
+            if player.play_single_action():
+                seen_hands[p].clear()
+                if player.action.is_waiting():  # nobody got there first
+                    player.action.set_granted()
+                    player.finish_single_action()
+                    self.middle_changes = self.middle_changes + 1
+                    if self.do_print:
+                        print('{:.2f}\t{} played to Middle'.format(now, player.name))
+            else:
+                hand = self.hand_state(player)
+                if hand in seen_hands[p]:
+                    parked.append(p)
+                    if self.do_print:
+                        print('{:.2f}\t{} is stuck until the Middle changes'.format(now, player.name))
+                    continue
+                seen_hands[p].add(hand)
+
+            if player.did_declare_nertz():
+                return
+
+            if self.middle_changes != middle_changes:
+                for seen in seen_hands:
+                    seen.clear()
+                for q in parked:
+                    heapq.heappush(events, (now + self.reaction_time(q), q))
+                parked.clear()
+
+            heapq.heappush(events, (now + self.reaction_time(p), p))
+
+        game.timeout = True
+
+    @staticmethod
+    def hand_state(player: Player):
+        # the Hand only changes order by being restacked, so its first card
+        # and how far it has been flipped identify where the player is in it
+        hand = player.handStack
+        if hand.is_empty():
+            return None
+        return id(hand.stack[0]), hand.get_top_face_up_idx()
@@ -32,9 +32,50 @@ class Action:
         return self.status == "granted"
 
 
+class Rules:
+    def __init__(self, nertz_size=13, flip_count=3, timeout=1000, win_score=100, jumps=None,
+                 max_replays=100):
+        self.nertz_size = nertz_size  # cards dealt to the Nertz pile
+        self.flip_count = flip_count  # cards flipped from the Hand at a time
+        self.timeout = timeout  # ticks before a round is abandoned & replayed
+        self.max_replays = max_replays  # timed out replays before the game is "stuck"
+        self.win_score = win_score
+        # score a player lands on exactly -> score they jump to
+        self.jumps = {-50: 50, -100: 100} if jumps is None else dict(jumps)
+
+        if nertz_size < 1:
+            raise ValueError('nertz_size must be at least 1')
+        if flip_count < 1:
+            raise ValueError('flip_count must be at least 1')
+        if nertz_size + 4 > 51 - flip_count:
+            raise ValueError('nertz_size {} with flip_count {} leaves fewer than flip_count cards for the Hand'
+                             .format(nertz_size, flip_count))
+        if max_replays < 0:
+            raise ValueError('max_replays can\'t be negative')
+
+    def key(self):
+        return (self.nertz_size, self.flip_count, self.timeout, self.win_score,
+                tuple(sorted(self.jumps.items())), self.max_replays)
+
+    def to_dict(self):
+        return {'nertz_size': self.nertz_size,
+                'flip_count': self.flip_count,
+                'timeout': self.timeout,
+                'win_score': self.win_score,
+                'jumps': sorted([score, jump] for score, jump in self.jumps.items()),
+                'max_replays': self.max_replays}
+
+
+def rules_from_dict(values):
+    return Rules(**values)
+
+
 class Player:
     def __init__(self, table, name, skill, strategy, do_print):
         self.table = table
+        # rule values are copied once here so the tick loop never looks them up
+        self.nertz_size = table.rules.nertz_size
+        self.flip_count = table.rules.flip_count
         self.name = name
         self.deck: List[Card] = []
         self.score = 0
@@ -53,10 +94,11 @@ class Player:
             for val in range(13):  # Ace, 1-10, J, Q, K
                 self.deck.append(Card(suit, val+1, name))
 
-    def clear_stacks(self):
-        self.solitaireStacks = [SolitaireStack(), SolitaireStack(), SolitaireStack(), SolitaireStack()]
-        self.nertzStack = NertzStack()
-        self.handStack = HandStack()
+    def clear_stacks(self):  # piles are reused every round, not reallocated
+        for stack in self.solitaireStacks:
+            stack.empty_stack()
+        self.nertzStack.empty_stack()
+        self.handStack.empty_stack()
 
     def declare_nertz(self):
         self.called_nertz = True
@@ -92,23 +134,26 @@ class Player:
     def shuffle_cards(self):
         random.shuffle(self.deck)
 
+    def reset_deck(self):  # put the deck back the way it was first made
+        self.deck.sort(key=lambda card: (card.suit, card.value))
+        for card in self.deck:
+            card.face_down = True
+
     def setup_cards(self):
         self.called_nertz = False
         self.clear_stacks()
         self.shuffle_cards()
 
-        for i in range(13):
+        for i in range(self.nertz_size):
             self.nertzStack.add_card(self.deck[i])
 
-        self.solitaireStacks[0].add_card(self.deck[13])
-        self.solitaireStacks[1].add_card(self.deck[14])
-        self.solitaireStacks[2].add_card(self.deck[15])
-        self.solitaireStacks[3].add_card(self.deck[16])
+        for s in range(4):
+            self.solitaireStacks[s].add_card(self.deck[self.nertz_size + s])
 
-        for i in range(17, 51):
+        for i in range(self.nertz_size + 4, 51):
             self.handStack.add_card(self.deck[i])
 
-        self.handStack.flip_three_cards()
+        self.handStack.flip_cards(self.flip_count)
 
     def check_and_move_aces(self):
         any_aces = False
@@ -286,35 +331,35 @@ class Player:
     def play_single_action(self):  # plays a single 'action', then returns
 
         # test actions in order of precedence
-        # return if action occurs
+        # return True if action occurs, False if the player could only flip
         self.action.clear()
 
         if self.check_and_move_aces():
-            return
+            return True
 
         if self.check_nertz_to_middle():
-            return
+            return True
 
         if self.play_nertz_on_solitaire():
-            return
+            return True
 
         if self.consolidate_solitaire():
-            return
+            return True
 
         if self.check_solitaire_to_middle():
-            return
+            return True
 
         if self.check_hand_to_middle():
-            return
+            return True
 
         if self.play_hand_on_solitaire():
-            return
+            return True
 
-        # if no action can happen, flip 3 cards
-        self.handStack.flip_three_cards()
+        # if no action can happen, flip flip_count cards
+        self.handStack.flip_cards(self.flip_count)
         if self.do_print:
-            print('{} flipped 3 cards'.format(self.name))
-        return
+            print('{} flipped {} cards'.format(self.name, self.flip_count))
+        return False
 
     def finish_single_action(self):
         if self.action.is_granted():
@@ -330,9 +375,15 @@ class Player:
 
 
 class Table:
-    def __init__(self):
+    def __init__(self, rules=None):
+        self.rules = Rules() if rules is None else rules
+        self.timeout = self.rules.timeout
+        self.max_replays = self.rules.max_replays
+        self.win_score = self.rules.win_score
+        self.jumps = self.rules.jumps
         self.players: List[Player] = []
         self.middleStacks: List[MiddleStack] = []
+        self.middlePool: List[MiddleStack] = []  # every Middle pile the Table may need
         self.do_print = False
         self.starting_player = 0
 
@@ -364,6 +415,9 @@ class Table:
 
     def add_player(self, name, skill, strat):
         self.players.append(Player(self, name, skill, strat, self.do_print))
+        # one Middle pile per ace in the new Player's deck
+        for _ in range(4):
+            self.middlePool.append(MiddleStack())
 
     def get_player(self, name):
         for player in self.players:
@@ -371,13 +425,22 @@ class Table:
                 return player
         return None
 
+    def reset_decks(self):
+        # a shuffle depends on the deck's previous order, so do this before
+        # seeding random to make a game repeatable on a used Table
+        for player in self.players:
+            player.reset_deck()
+
     def start_middle_stack(self, card: Card):
-        self.middleStacks.append(MiddleStack())
-        self.middleStacks[len(self.middleStacks)-1].add_card(card)
+        stack = self.middlePool[len(self.middleStacks)]
+        self.middleStacks.append(stack)
+        stack.add_card(card)
 
     def setup_table(self):
         for player in self.players:
             player.setup_cards()
+        for stack in self.middleStacks:
+            stack.empty_stack()
         self.middleStacks.clear()
 
     def play_one_tick(self):
@@ -422,7 +485,7 @@ class Table:
         return
 
     def play_round(self, game):
-        timeout = 1000
+        timeout = self.timeout
         count = 0
         round_over = False
         game.timeout = False
@@ -440,24 +503,35 @@ class Table:
             count = count + 1
         #self.print_all_stacks(True)
 
-    def score_round(self, game):
+    def round_deltas(self):
+        # points each player (in seat order) gets for the round just played:
+        # +1 per card they put in the Middle, -2 per card left in their Nertz
+        seats = {}
+        for p in range(len(self.players)):
+            seats[self.players[p].name] = p
+        deltas = [0] * len(self.players)
 
         for middle_stack in self.middleStacks:
             for card in middle_stack.stack:
-                self.get_player(card.owner).add_one()
+                deltas[seats[card.owner]] += 1
 
-        for player in self.players:
-            for card in player.nertzStack.stack:
-                player.minus_two()
+        for p in range(len(self.players)):
+            deltas[p] -= 2 * self.players[p].nertzStack.get_size()
+
+        return deltas
+
+    def score_round(self, game, deltas=None):
+
+        if deltas is None:
+            deltas = self.round_deltas()
+        for p in range(len(self.players)):
+            self.players[p].score = self.players[p].score + deltas[p]
 
         for player in self.players:
-            if player.score == -50:
-                player.score = 50
-                #print('{} jumped from -50 to +50!'.format(player.name))
-            if player.score == -100:
-                player.score = 100
-                #print('{} jumped from -100 to +100!'.format(player.name))
-            if player.score >= 100:
+            if player.score in self.jumps:
+                player.score = self.jumps[player.score]
+                #print('{} jumped to {}!'.format(player.name, player.score))
+            if player.score >= self.win_score:
                 game.winner = player.name
                 game.is_over = True
 
@@ -466,42 +540,67 @@ class Table:
         return game
 
     def play_game(self):
-
         game = Game()
-        game.round_count = 0
+        for record in self.play_rounds(game):
+            pass
+        return game
 
-        while not game.is_over:
-            game.timeout = True
-            while game.timeout:  # keep playing rounds until games DOESN'T timeout
-                self.setup_table()
-                self.play_round(game)
-            game.round_count = game.round_count + 1
-            game = self.score_round(game)
-            # if game.timeout:
-            #    game.is_over = True
-            #    game.winner = "stuck"
-            #    game.round_count = -1
+    def play_rounds(self, game):
+        # plays 'game' one round at a time, yielding a RoundRecord after each
+        # scored round; nothing is simulated until the next record is asked
+        # for, and scores are reset even if the caller stops early. If a round
+        # still times out after max_replays replays, the game ends "stuck".
+        game.round_count = 0
 
-        if self.do_print:
-            print('+=========================+')
-            print('| Game over in {} rounds |'.format(game.round_count))
-            print('+=========================+')
+        try:
+            while not game.is_over:
+                timeouts = -1
+                game.timeout = True
+                while game.timeout and timeouts < self.max_replays:  # replay until it DOESN'T timeout
+                    self.setup_table()
+                    self.play_round(game)
+                    timeouts = timeouts + 1
+                if game.timeout:
+                    game.is_over = True
+                    game.winner = "stuck"
+                    game.scores = [player.score for player in self.players]
+                    yield RoundRecord(game.round_count, [0] * len(self.players), game.scores, timeouts,
+                                      game.winner)
+                    break
+                game.round_count = game.round_count + 1
+                deltas = self.round_deltas()
+                game = self.score_round(game, deltas)
+                game.scores = [player.score for player in self.players]
+                yield RoundRecord(game.round_count, deltas, game.scores, timeouts, game.winner)
 
-        for player in self.players:
-            player.score = 0
+            if self.do_print:
+                print('+=========================+')
+                print('| Game over in {} rounds |'.format(game.round_count))
+                print('+=========================+')
 
-        return game
+        finally:
+            for player in self.players:
+                player.score = 0
 
 
 class Game:
     def __init__(self):
         self.round_count = 0
         self.winner = ""
-        self.scores = []
+        self.scores = []  # each player's score, in seat order, after the last round
         self.is_over = False
         self.timeout = False
 
 
+class RoundRecord:
+    def __init__(self, round_count, deltas, scores, timeouts, winner):
+        self.round_count = round_count
+        self.deltas = deltas  # points each player got this round, before jumps
+        self.scores = scores  # scores after the round, with jumps applied
+        self.timeouts = timeouts  # timed out attempts replayed for this round
+        self.winner = winner  # "" until the round that ends the game, "stuck" if it never ends
+
+
 def pick_a_player(num_players):
     chances = []
     for p in range(num_players):
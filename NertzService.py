@@ -0,0 +1,291 @@
+from NertzSweep import *
+from collections import OrderedDict, deque
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+
+# Long-running simulation service. Worker processes stay alive between jobs
+# and keep the Tables they have built, so a sweep pays only for the games.
+#
+# Protocol: newline-delimited JSON over a Unix socket or localhost TCP.
+#   {"op": "submit", "spec": {...}}  -> accepted, result..., done|cancelled
+#   {"op": "cancel", "job": id}      -> {"ok": true|false}
+#   {"op": "status"}                 -> running jobs & pending work units
+#
+# A spec looks like:
+#   {"players": [4, 5], "skills": ["best"], "strategies": ["never", "always"],
+#    "rules": [{}, {"flip_count": 1}], "engines": ["tick", "event"],
+#    "games": 1000, "seed": 10, "chunk": 25}
+
+DEFAULT_CHUNK = 25
+MAX_WARM_TABLES = 16  # per worker; the least recently used are dropped
+
+_tables = OrderedDict()  # warm Tables inside each worker process, keyed by config
+
+
+def _run_unit(config_values, seeds):
+    config = config_from_dict(config_values)
+    table = _tables.get(config.key())
+    if table is None:
+        table = config.build_table()
+        _tables[config.key()] = table
+        if len(_tables) > MAX_WARM_TABLES:
+            _tables.popitem(last=False)
+    else:
+        _tables.move_to_end(config.key())
+
+    return [[r.seed, r.winner, r.round_count] for r in iter_games(table, seeds)]
+
+
+class Job:
+    def __init__(self, job_id, spec):
+        self.id = job_id
+        self.configs = expand_sweep(spec)
+        self.events = queue.Queue()
+        self.in_flight = 0
+        self.cancelled = False
+
+        # units are handed out lazily from a cursor over (config, first game)
+        # so even a huge job costs nothing to set up
+        self.seeds = game_seeds(spec)
+        self.chunk = max(1, spec.get('chunk', DEFAULT_CHUNK))
+        self.units_per_config = -(-len(self.seeds) // self.chunk)
+        self.total_units = len(self.configs) * self.units_per_config
+        self.issued = 0
+
+    def get_pending(self):
+        return 0 if self.cancelled else self.total_units - self.issued
+
+    def next_unit(self):
+        c, u = divmod(self.issued, self.units_per_config)
+        self.issued = self.issued + 1
+        start = u * self.chunk
+        return c, start, self.seeds[start:start + self.chunk]
+
+    def is_finished(self):
+        return self.in_flight == 0 and self.get_pending() == 0
+
+
+class Scheduler:
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = multiprocessing.Pool(self.workers)
+        self.jobs = {}
+        self.rotation = deque()  # job ids, round-robin order
+        self.lock = threading.Condition()
+        self.next_id = itertools.count(1)
+        self.in_flight = 0
+        self.running = True
+        self.thread = threading.Thread(target=self.dispatch, daemon=True)
+        self.thread.start()
+
+    def submit(self, spec):
+        job = Job(next(self.next_id), spec)
+        with self.lock:
+            self.jobs[job.id] = job
+            self.rotation.append(job.id)
+            job.events.put({'event': 'accepted', 'job': job.id,
+                            'configs': [c.to_dict() for c in job.configs],
+                            'units': job.total_units})
+            self.check_finished(job)
+            self.lock.notify_all()
+        return job
+
+    def cancel(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.cancelled:
+                return False
+            job.cancelled = True
+            self.check_finished(job)
+            self.lock.notify_all()
+            return True
+
+    def status(self):
+        with self.lock:
+            return {'workers': self.workers,
+                    'in_flight': self.in_flight,
+                    'jobs': {job.id: job.get_pending() for job in self.jobs.values()}}
+
+    def next_unit(self):
+        # fair scheduling: take one unit from each job with work in turn
+        for _ in range(len(self.rotation)):
+            job = self.jobs[self.rotation[0]]
+            self.rotation.rotate(-1)
+            if job.get_pending() > 0:
+                return job, job.next_unit()
+        return None, None
+
+    def dispatch(self):
+        with self.lock:
+            while self.running:
+                job, unit = None, None
+                if self.in_flight < self.workers:
+                    job, unit = self.next_unit()
+                if job is None:
+                    self.lock.wait()
+                    continue
+                c, start, seeds = unit
+                job.in_flight = job.in_flight + 1
+                self.in_flight = self.in_flight + 1
+                self.pool.apply_async(_run_unit, (job.configs[c].to_dict(), seeds),
+                                      callback=self.unit_callback(job, c, start),
+                                      error_callback=self.unit_error(job))
+
+    def unit_callback(self, job, c, start):
+        def callback(results):
+            with self.lock:
+                self.unit_done(job)
+                if not job.cancelled:
+                    job.events.put({'event': 'result', 'job': job.id, 'config': c,
+                                    'first_game': start, 'games': results})
+                self.check_finished(job)
+        return callback
+
+    def unit_error(self, job):
+        def callback(error):
+            with self.lock:
+                self.unit_done(job)
+                if not job.cancelled:
+                    job.cancelled = True
+                    job.events.put({'event': 'error', 'job': job.id, 'message': repr(error)})
+                self.check_finished(job)
+        return callback
+
+    def unit_done(self, job):
+        job.in_flight = job.in_flight - 1
+        self.in_flight = self.in_flight - 1
+        self.lock.notify_all()
+
+    def check_finished(self, job):
+        if job.id in self.jobs and job.is_finished():
+            job.events.put({'event': 'cancelled' if job.cancelled else 'done', 'job': job.id})
+            del self.jobs[job.id]
+            self.rotation.remove(job.id)
+
+    def close(self):
+        with self.lock:
+            self.running = False
+            self.lock.notify_all()
+        self.pool.terminate()
+        self.pool.join()
+
+
+class ServiceHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        scheduler: Scheduler = self.server.scheduler
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                op = request.get('op')
+                if op == 'submit':
+                    self.stream_job(scheduler, scheduler.submit(request['spec']))
+                elif op == 'cancel':
+                    self.send({'ok': scheduler.cancel(request['job'])})
+                elif op == 'status':
+                    self.send(scheduler.status())
+                else:
+                    self.send({'event': 'error', 'message': 'unknown op {}'.format(op)})
+            except (ValueError, KeyError, TypeError) as error:
+                self.send({'event': 'error', 'message': repr(error)})
+            except OSError:
+                return
+
+    def stream_job(self, scheduler, job):
+        # results are written as soon as each work unit finishes; if the
+        # client goes away the rest of the job is cancelled
+        while True:
+            event = job.events.get()
+            try:
+                self.send(event)
+            except OSError:
+                scheduler.cancel(job.id)
+                raise
+            if event['event'] in ('done', 'cancelled', 'error'):
+                return
+
+    def send(self, message):
+        self.wfile.write((json.dumps(message) + '\n').encode())
+        self.wfile.flush()
+
+
+class TCPService(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class UnixService(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def parse_address(address):
+    # "host:port" for TCP, anything else is a Unix socket path
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit():
+        return host or 'localhost', int(port)
+    return address
+
+
+def make_server(address, workers=None):
+    address = parse_address(address)
+    if isinstance(address, tuple):
+        server = TCPService(address, ServiceHandler)
+    else:
+        if os.path.exists(address):
+            os.remove(address)
+        server = UnixService(address, ServiceHandler)
+    server.scheduler = Scheduler(workers)
+    return server
+
+
+def serve(address, workers=None):
+    server = make_server(address, workers)
+    print('Nertz service listening on {}'.format(address))
+    try:
+        server.serve_forever()
+    finally:
+        server.scheduler.close()
+        server.server_close()
+
+
+def connect(address):
+    address = parse_address(address)
+    if isinstance(address, tuple):
+        return socket.create_connection(address)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(address)
+    return sock
+
+
+def request(address, message):
+    with connect(address) as sock:
+        sock.sendall((json.dumps(message) + '\n').encode())
+        return json.loads(sock.makefile().readline())
+
+
+def run_sweep(address, spec):
+    # yields each event of the job as it streams back from the service
+    with connect(address) as sock:
+        sock.sendall((json.dumps({'op': 'submit', 'spec': spec}) + '\n').encode())
+        for line in sock.makefile():
+            event = json.loads(line)
+            yield event
+            if event['event'] in ('done', 'cancelled', 'error'):
+                return
+
+
+def cancel_job(address, job_id):
+    return request(address, {'op': 'cancel', 'job': job_id})['ok']
+
+
+if __name__ == '__main__':
+    serve(sys.argv[1] if len(sys.argv) > 1 else 'localhost:8765',
+          int(sys.argv[2]) if len(sys.argv) > 2 else None)
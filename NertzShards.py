@@ -0,0 +1,148 @@
+from NertzSweep import *
+import subprocess
+import sys
+
+# Splitting a sweep across machines. A sweep spec is planned into N shard
+# manifests, each listing the (configuration, game range) pieces it covers.
+# Any machine can run a manifest and write a result file that says exactly
+# what it contains; merging every shard's result gives the same statistics
+# as running the whole sweep in one place, since game g always uses seed
+# (seed + g).
+#
+#   python NertzShards.py plan spec.json 8 shards/
+#   python NertzShards.py run shards/shard-003.json shards/result-003.json
+#   python NertzShards.py merge shards/result-*.json
+
+SHARD_FORMAT = 1
+
+
+def plan_shards(spec, num_shards):
+    # the sweep's games, config by config, are cut into num_shards slices
+    # that differ in size by at most one game
+    configs = expand_sweep(spec)
+    seeds = game_seeds(spec)
+    games = len(seeds)
+    total = len(configs) * games
+    if num_shards < 1:
+        raise ValueError('need at least one shard')
+
+    manifests = []
+    for shard in range(num_shards):
+        start = total * shard // num_shards
+        stop = total * (shard + 1) // num_shards
+        pieces = []
+        while start < stop:
+            c, first_game = divmod(start, games)
+            count = min(stop - start, games - first_game)
+            pieces.append({'config_index': c,
+                           'config': configs[c].to_dict(),
+                           'first_game': first_game,
+                           'first_seed': seeds[first_game],
+                           'games': count})
+            start = start + count
+        manifests.append({'format': SHARD_FORMAT,
+                          'sweep': spec_id(spec),
+                          'spec': spec,
+                          'code_version': code_version(),
+                          'shard': shard,
+                          'shards': num_shards,
+                          'pieces': pieces})
+    return manifests
+
+
+def write_manifests(spec, num_shards, directory):
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for manifest in plan_shards(spec, num_shards):
+        path = os.path.join(directory, 'shard-{:03d}.json'.format(manifest['shard']))
+        write_json(path, manifest)
+        paths.append(path)
+    return paths
+
+
+def run_shard(manifest):
+    if manifest.get('format') != SHARD_FORMAT:
+        raise ValueError('not a shard manifest this version can read')
+    if manifest['code_version'] != code_version():
+        raise ValueError('shard was planned for code version {}, this is {}'.format(
+            manifest['code_version'], code_version()))
+
+    result = dict(manifest)
+    result['results'] = []
+    for piece in manifest['pieces']:
+        table = config_from_dict(piece['config']).build_table()
+        seeds = range(piece['first_seed'], piece['first_seed'] + piece['games'])
+        games = [[r.seed, r.winner, r.round_count] for r in iter_games(table, seeds)]
+        result['results'].append(dict(piece, results=games))
+    return result
+
+
+def merge_results(results):
+    # checks the shards all belong to one sweep and cover it exactly once,
+    # then returns a GameStats per configuration, in config order
+    if len(results) == 0:
+        raise ValueError('no shard results to merge')
+    first = results[0]
+    shards = sorted(result['shard'] for result in results)
+    if shards != list(range(first['shards'])):
+        raise ValueError('expected shards 0-{}, got {}'.format(first['shards'] - 1, shards))
+    for result in results:
+        if result['sweep'] != first['sweep'] or result['code_version'] != first['code_version']:
+            raise ValueError('shard {} is from a different sweep or code version'.format(result['shard']))
+
+    configs = expand_sweep(first['spec'])
+    stats = [GameStats() for config in configs]
+    covered = [0] * len(configs)
+    for result in results:
+        for piece in result['results']:
+            piece_stats = GameStats()
+            for seed, winner, round_count in piece['results']:
+                piece_stats.add_game(winner, round_count)
+            stats[piece['config_index']].merge(piece_stats)
+            covered[piece['config_index']] += piece_stats.games
+
+    games = len(game_seeds(first['spec']))
+    for c in range(len(configs)):
+        if covered[c] != games:
+            raise ValueError('config {} has {} of {} games'.format(c, covered[c], games))
+    return stats
+
+
+def run_local(spec, num_shards, directory):
+    # runs every shard as its own process, as separate machines would
+    processes = []
+    for path in write_manifests(spec, num_shards, directory):
+        out = os.path.join(os.path.dirname(path), os.path.basename(path).replace('shard-', 'result-'))
+        processes.append((subprocess.Popen([sys.executable, os.path.abspath(__file__), 'run', path, out]), out))
+    for process, out in processes:
+        if process.wait() != 0:
+            raise RuntimeError('shard {} failed'.format(out))
+    return merge_results([read_json(out) for process, out in processes])
+
+
+def write_json(path, values):
+    # written to a temporary name first so a crash never leaves half a file
+    with open(path + '.tmp', 'w') as f:
+        json.dump(values, f)
+    os.replace(path + '.tmp', path)
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 5 and sys.argv[1] == 'plan':
+        for p in write_manifests(read_json(sys.argv[2]), int(sys.argv[3]), sys.argv[4]):
+            print(p)
+    elif len(sys.argv) == 4 and sys.argv[1] == 'run':
+        write_json(sys.argv[3], run_shard(read_json(sys.argv[2])))
+    elif len(sys.argv) > 2 and sys.argv[1] == 'merge':
+        results = [read_json(p) for p in sys.argv[2:]]
+        for config, stats in zip(expand_sweep(results[0]['spec']), merge_results(results)):
+            print(config.to_dict())
+            stats.print_stats()
+    else:
+        print('usage: NertzShards.py plan SPEC N DIR | run MANIFEST OUT | merge RESULT...')
+        sys.exit(2)
@@ -0,0 +1,212 @@
+from NertzGame import *
+from NertzEvents import *
+from collections import Counter
+from typing import List
+import hashlib
+import itertools
+import json
+import os
+
+# Shared helpers for running sweeps of games: expanding a sweep spec into
+# table configurations and playing reproducible, individually seeded games.
+
+NAMES = ['Alf', 'Bob', 'Cat', 'Dog', 'Ela', 'Flo', 'Gob', 'Hal', 'Ike', 'Joe']
+SKILLS = ['bad', 'good', 'better', 'best']
+STRATEGIES = ['never', 'one-deep', 'two-deep', 'always']
+ENGINES = {'tick': Table, 'event': EventTable}
+
+
+class SweepConfig:
+    def __init__(self, num_players, skills, strategies, rules=None, engine='tick'):
+        # skills & strategies are either a single value for every seat,
+        # or a per-seat list which is cycled if the table is bigger
+        self.num_players = num_players
+        self.skills = self.per_seat(skills)
+        self.strategies = self.per_seat(strategies)
+        self.rules = Rules() if rules is None else rules
+        if engine not in ENGINES:
+            raise ValueError('unknown engine {}'.format(engine))
+        self.engine = engine
+
+    def per_seat(self, values):
+        if isinstance(values, str):
+            values = [values]
+        return [values[n % len(values)] for n in range(self.num_players)]
+
+    def key(self):
+        return self.num_players, tuple(self.skills), tuple(self.strategies), self.rules.key(), self.engine
+
+    def to_dict(self):
+        return {'players': self.num_players,
+                'skills': list(self.skills),
+                'strategies': list(self.strategies),
+                'rules': self.rules.to_dict(),
+                'engine': self.engine}
+
+    def build_table(self):
+        table = ENGINES[self.engine](self.rules)
+        for n in range(self.num_players):
+            table.add_player(NAMES[n], self.skills[n], self.strategies[n])
+        return table
+
+
+class GameStats:
+    # counts rather than lists, so stats from separate runs merge exactly
+    def __init__(self):
+        self.winners = Counter()
+        self.round_counts = Counter()
+        self.jumps = Counter()  # (from score, to score) -> times it happened
+        self.games = 0
+
+    def add_game(self, winner, round_count):
+        self.winners[winner] += 1
+        self.round_counts[round_count] += 1
+        self.games = self.games + 1
+
+    def merge(self, other):
+        self.winners.update(other.winners)
+        self.round_counts.update(other.round_counts)
+        self.jumps.update(other.jumps)
+        self.games = self.games + other.games
+
+    def mean_rounds(self):
+        return sum(n * count for n, count in self.round_counts.items()) / self.games
+
+    def median_rounds(self):
+        # same as statistics.median over every game's round count
+        middle = [(self.games - 1) // 2, self.games // 2]
+        values = []
+        seen = 0
+        for n in sorted(self.round_counts):
+            for idx in middle:
+                if seen <= idx < seen + self.round_counts[n]:
+                    values.append(n)
+            seen = seen + self.round_counts[n]
+        return sum(values) / 2 if values[0] != values[1] else values[0]
+
+    def print_stats(self):
+        print(self.winners)
+        if self.games == 0:
+            print('no games played')
+            return
+        print('mean = {} \t median = {} \t max = {} \t min = {}'.format(
+            self.mean_rounds(), self.median_rounds(), max(self.round_counts), min(self.round_counts)))
+        for (before, after), count in sorted(self.jumps.items()):
+            print('{} jumps from {} to {}'.format(count, before, after))
+
+
+def config_from_dict(values):
+    rules = rules_from_dict(values['rules']) if 'rules' in values else None
+    return SweepConfig(values['players'], values['skills'], values['strategies'], rules,
+                       values.get('engine', 'tick'))
+
+
+def expand_sweep(spec) -> List[SweepConfig]:
+    # every combination of player count, skill, strategy, rules and engine
+    player_nums = spec.get('players', [4])
+    if isinstance(player_nums, int):
+        player_nums = [player_nums]
+    skills = spec.get('skills', [SKILLS[3]])
+    if isinstance(skills, str):
+        skills = [skills]
+    strategies = spec.get('strategies', [STRATEGIES[0]])
+    if isinstance(strategies, str):
+        strategies = [strategies]
+    rules = spec.get('rules', [{}])
+    if isinstance(rules, dict):
+        rules = [rules]
+    rules = [rules_from_dict(r) for r in rules]
+    engines = spec.get('engines', ['tick'])
+    if isinstance(engines, str):
+        engines = [engines]
+
+    for num in player_nums:
+        if num < 1 or num > len(NAMES):
+            raise ValueError('player count must be between 1 and {}'.format(len(NAMES)))
+
+    configs = []
+    for num in player_nums:
+        for skill in skills:
+            for strat in strategies:
+                for r in rules:
+                    for engine in engines:
+                        configs.append(SweepConfig(num, skill, strat, r, engine))
+    return configs
+
+
+def game_seeds(spec):
+    # game g of a sweep is always played with seed (seed + g), no matter
+    # how the sweep is split up, so any piece of it can be re-run exactly
+    first = spec.get('seed', 0)
+    games = spec.get('games', 1)
+    if not isinstance(games, int):
+        raise ValueError('games must be a whole number of games, not {!r}'.format(games))
+    return range(first, first + games)
+
+
+def open_game_seeds(spec):
+    # like game_seeds, but "games": None means keep going forever; only for
+    # the generators below, everything else needs to know when it is done
+    if spec.get('games', 1) is None:
+        return itertools.count(spec.get('seed', 0))
+    return game_seeds(spec)
+
+
+def code_version():
+    # changes whenever the code that plays a game changes, so results from
+    # different versions are never mixed
+    digest = hashlib.sha1()
+    for name in ['Card.py', 'NertzGame.py', 'NertzEvents.py', 'NertzSweep.py']:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def spec_id(spec):
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def seed_table(table: Table, seed):
+    # everything a game depends on besides the Table's setup, so a seeded
+    # game plays the same no matter what the Table played before
+    table.reset_decks()
+    table.starting_player = 0
+    random.seed(seed)
+
+
+def play_seeded_game(table: Table, seed):
+    seed_table(table, seed)
+    return table.play_game()
+
+
+class GameRecord:
+    def __init__(self, seed, winner, round_count, scores):
+        self.seed = seed
+        self.winner = winner
+        self.round_count = round_count
+        self.scores = scores  # final scores, in seat order
+
+
+def iter_games(table: Table, seeds):
+    # yields one GameRecord per seed, playing each game only when asked for
+    for seed in seeds:
+        game = play_seeded_game(table, seed)
+        yield GameRecord(seed, game.winner, game.round_count, game.scores)
+
+
+def iter_rounds(table: Table, seed):
+    # the rounds of one seeded game as RoundRecords, e.g. to trace or draw it.
+    # The game is seeded when the first round is asked for, but rounds share
+    # the global random, so stepping through two games' rounds at once (or
+    # using random in between) makes them unrepeatable; finish one first.
+    seed_table(table, seed)
+    yield from table.play_rounds(Game())
+
+
+def iter_sweep(spec):
+    # yields (config, GameRecord) for a whole sweep, config by config, so an
+    # unbounded sweep can be consumed in constant memory and stopped any time.
+    # With "games": None the first config's games never run out.
+    for config in expand_sweep(spec):
+        for record in iter_games(config.build_table(), open_game_seeds(spec)):
+            yield config, record
@@ -1,35 +1,27 @@
 from statistics import mean, median
 from collections import Counter
 from NertzGame import *
+from NertzCache import *
 from NertzGUI import *
 
-# Press the green button in the gutter to run the script.
-if __name__ == '__main__':
 
-    # get # of players & their names
-    random.seed = 10
+def print_progress(done):
+    # a dot every 10 games, and a new line every 100
+    g = done - 1
+    if g > 0 and g % 100 == 0:
+        print('.')
+    elif g > 0 and g % 10 == 0:
+        print('.', end='', flush=True)
 
-    names = ['Alf',
-             'Bob',
-             'Cat',
-             'Dog',
-             'Ela',
-             'Flo',
-             'Gob',
-             'Hal',
-             'Ike',
-             'Joe']
 
-    skills = ['bad',
-              'good',
-              'better',
-              'best']
+# Press the green button in the gutter to run the script.
+if __name__ == '__main__':
 
-    strategy = ['never',
-                'one-deep',
-                'two-deep',
-                'always']
+    # get # of players & their names
+    seed = 10  # game g is played with seed (seed + g), so results are cached
+    cache = ResultCache('.nertz_cache')
 
+    # player names, skills & strategies are NAMES, SKILLS & STRATEGIES from NertzSweep
     inputs = getInputs()
 
     #player_nums = [3,4,5,6]
@@ -37,26 +29,19 @@ if __name__ == '__main__':
     number_games = inputs[1]
 
     for num in player_nums:
-        table = Table()
         print('Playing {} games with {} players'.format(number_games, num))
-        for n in range(num):
-            table.add_player(names[n], skills[3], strategy[0])
-        #table.players[0].strat = strategy[0]
-        #table.players[1].strat = strategy[1]
-        #table.players[2].strat = strategy[2]
-        #table.players[3].strat = strategy[3]
+        config = SweepConfig(num, SKILLS[3], STRATEGIES[0])
+        #config = SweepConfig(num, SKILLS[3], [STRATEGIES[0], STRATEGIES[1], STRATEGIES[2], STRATEGIES[3]])
         winners = []
         counts = []
-        for g in range(number_games):
-            game_stats = table.play_game()
-            winners.append(game_stats.winner)
-            counts.append(game_stats.round_count)
-            if g > 0 and g % 100 == 0:
-                print('.')
-            elif g > 0 and g % 10 == 0:
-                print('.', end='')
+        games = cache.get_games(config, range(seed, seed + number_games), progress=print_progress)
+        for seed_game, winner, round_count in games:
+            winners.append(winner)
+            counts.append(round_count)
 
         print()
+        print('{} games from cache, {} played'.format(cache.hits, cache.misses))
+        cache.reset_counts()
         print(Counter(winners))
         print('mean = {} \t median = {} \t max = {} \t min = {}'.format(mean(counts), median(counts), max(counts), min(counts)))
     #print()
@@ -66,7 +51,7 @@ if __name__ == '__main__':
     #    table = Table()
     #    print('For {} players, playing {} games'.format(num, number_games))
     #    for n in range(num):
-    #        table.add_player(names[n], skills[3], strategy[0])
+    #        table.add_player(NAMES[n], SKILLS[3], STRATEGIES[0])
     #    for g in range(number_games):
     #        counts.append(table.play_game())
     #    print('{}\nmean = {} \t median = {} \t max = {} \t min = {}'.format(counts, mean(counts), median(counts), max(counts), min(counts)))
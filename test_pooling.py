@@ -0,0 +1,33 @@
+import unittest
+from NertzGame import *
+
+
+class TestPooling(unittest.TestCase):
+    def test_rounds_allocate_nothing(self):
+        random.seed(1)
+        table = Table()
+        for name in ['Alf', 'Bob', 'Cat', 'Dog']:
+            table.add_player(name, 'best', 'never')
+        game = Game()
+        table.setup_table()
+        table.play_round(game)
+
+        before = dict(allocations)
+        for r in range(3):
+            table.setup_table()
+            table.play_round(game)
+            self.assertEqual(dict(allocations), before)
+
+    def test_restack_keeps_hand_list(self):
+        hand = HandStack()
+        for val in range(5):
+            hand.add_card(Card('A', val + 1, 'Alf'))
+        cards = hand.stack
+        hand.flip_cards(3)
+        hand.flip_cards(3)  # only 2 face down cards left, so it restacks
+        self.assertIs(hand.stack, cards)
+        self.assertEqual([card.value for card in hand.stack], [3, 4, 5, 1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()